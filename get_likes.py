@@ -15,14 +15,19 @@ from datetime import datetime, timezone
 import requests
 from bs4 import BeautifulSoup
 
+# Shared session so the paginated API calls reuse one keep-alive connection
+SESSION = requests.Session()
+SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+})
+
+CLIENT_ID_RE = re.compile(r'client_id[:=]\s*["\']([a-zA-Z0-9]{32})["\']')
+
 def get_client_id():
     """
     Dynamically extract the client_id from SoundCloud's web assets.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    r = requests.get("https://soundcloud.com", headers=headers)
+    r = SESSION.get("https://soundcloud.com", timeout=10)
     if r.status_code != 200:
         print(f"Error: Failed to fetch SoundCloud homepage: {r.status_code}", file=sys.stderr)
         return None
@@ -31,11 +36,9 @@ def get_client_id():
     scripts = [s.get('src') for s in soup.find_all('script') if s.get('src')]
     inline_scripts = [s.string for s in soup.find_all('script') if s.string]
     
-    client_id_re = re.compile(r'client_id[:=]\s*["\']([a-zA-Z0-9]{32})["\']')
-    
     # Try inline scripts first
     for js in inline_scripts:
-        m = client_id_re.search(js)
+        m = CLIENT_ID_RE.search(js)
         if m:
             return m.group(1)
             
@@ -45,9 +48,9 @@ def get_client_id():
         if "sndcdn.com" not in full_src and "soundcloud.com" not in full_src:
             continue
         try:
-            js_r = requests.get(full_src, headers=headers, timeout=5)
+            js_r = SESSION.get(full_src, timeout=5)
             if js_r.status_code == 200:
-                m = client_id_re.search(js_r.text)
+                m = CLIENT_ID_RE.search(js_r.text)
                 if m:
                     return m.group(1)
         except Exception:
@@ -67,10 +70,7 @@ def resolve_profile(profile, client_id):
         profile_url = profile
 
     resolve_url = f"https://api-v2.soundcloud.com/resolve?url={profile_url}&client_id={client_id}"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    r = requests.get(resolve_url, headers=headers)
+    r = SESSION.get(resolve_url, timeout=10)
     if r.status_code != 200:
         print(f"Error: Failed to resolve SoundCloud profile '{profile_url}': {r.status_code}", file=sys.stderr)
         return None
@@ -97,15 +97,11 @@ def fetch_likes(user_id, client_id, start_date=None, end_date=None):
     """
     Generator that fetches all likes for a user, handling pagination and date boundaries.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
-    
     # We will use track_likes as our primary endpoint
     next_url = f"https://api-v2.soundcloud.com/users/{user_id}/track_likes?client_id={client_id}&limit=50"
     
     while next_url:
-        r = requests.get(next_url, headers=headers)
+        r = SESSION.get(next_url, timeout=10)
         if r.status_code != 200:
             print(f"Error: Failed fetching likes page: {r.status_code}", file=sys.stderr)
             break
@@ -1,3 +1,13 @@
+import os
+
 from setuptools import setup
 
-setup()
+ext_modules = []
+if os.environ.get("MUSIC_DOWNLOADER_MYPYC"):
+    # Optionally compile the metadata scraper into a C extension with mypyc;
+    # the pure-Python module is still shipped as the fallback
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["src/music_downloader/metadata.py"])
+
+setup(ext_modules=ext_modules)
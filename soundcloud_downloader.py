@@ -8,44 +8,88 @@ Supports parallel downloads using asyncio.
 import argparse
 import asyncio
 import os
+import shutil
 import sys
-from subprocess import run
+import weakref
 from tqdm.asyncio import tqdm as async_tqdm
 from rich import print as rprint
 
 from music_downloader.metadata import (
-    extract_soundcloud_metadata,
+    create_async_client,
+    extract_soundcloud_metadata_async,
     update_metadata,
 )
 
 
+# Concurrency limit for callers that don't pass their own semaphore. A semaphore
+# can only be used from one event loop, so there is one per running loop
+_DEFAULT_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _default_semaphore():
+    """Return the running event loop's default semaphore, sized from the CPU count."""
+    loop = asyncio.get_running_loop()
+    semaphore = _DEFAULT_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _DEFAULT_SEMAPHORES[loop] = asyncio.Semaphore(
+            max(4, os.cpu_count() or 2)
+        )
+    return semaphore
+
+
+def check_dependencies():
+    """Return the required executables (yt-dlp, ffmpeg) missing from PATH."""
+    return [name for name in ("yt-dlp", "ffmpeg") if shutil.which(name) is None]
+
+
+def _error_summary(lines, tail=5):
+    """
+    Pick the useful part of yt-dlp's output for a failed download: its ERROR and
+    WARNING lines, or else the last few lines, rather than every progress update.
+    """
+    problems = [line for line in lines if line.startswith(("ERROR:", "WARNING:"))]
+    return "\n".join(problems or lines[-tail:])
+
+
+async def _tag_file(url, output_file, meta_task):
+    """
+    Wait for the background metadata fetch, then tag the downloaded file.
+    Failures are only reported; they never change the download's result.
+    """
+    try:
+        track_info = await meta_task
+        rprint(track_info)
+    except Exception as e:
+        print(f"Error extracting metadata for {url}: {e}")
+        return
+    if track_info:
+        print(f"Updating metadata for: {os.path.basename(output_file)}")
+        try:
+            await asyncio.to_thread(update_metadata, output_file, track_info)
+        except Exception as e:
+            print(f"Error updating metadata for {url}: {e}")
+
+
 async def download_soundcloud(
     url, output_dir=".", audio_format="mp3", audio_quality="320k", with_metadata=True,
-    semaphore=None
+    semaphore=None, client=None
 ):
     """Download audio from SoundCloud URL and set metadata asynchronously."""
-    # Use the semaphore to limit concurrent downloads if provided
-    async with semaphore or asyncio.Semaphore(1):
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
+    # Limit concurrent downloads with the given semaphore, or the shared default
+    async with semaphore or _default_semaphore():
         print(f"Downloading from: {url}")
 
-        # Track information (only fetch if metadata is enabled)
-        track_info = {}
+        # Track information (only fetch if metadata is enabled), fetched in the
+        # background so it overlaps with the download
+        meta_task = None
         if with_metadata:
-            try:
-                track_info = extract_soundcloud_metadata(url)
-                rprint(track_info)
-            except Exception as e:
-                print(f"Error extracting metadata for {url}: {e}")
+            meta_task = asyncio.create_task(
+                extract_soundcloud_metadata_async(url, client)
+            )
 
         # Set output filename template
         filename_template = os.path.join(output_dir, "%(title)s.%(ext)s")
 
-        # Create a temporary file to capture the output
-        temp_output_file = os.path.join(output_dir, f"temp_output_{hash(url)}.txt")
-
         # Command construction for yt-dlp
         cmd = [
             "yt-dlp",
@@ -57,6 +101,7 @@ async def download_soundcloud(
             "--output",
             filename_template,
             "--progress",  # Show progress
+            "--newline",  # One progress update per line, so output can be streamed
             "--print",
             "after_move:filepath",
             url,
@@ -64,47 +109,66 @@ async def download_soundcloud(
 
         # Run the command and capture output
         try:
-            # Run the command in a separate process and wait for it to complete
-            process = await asyncio.to_thread(
-                run, cmd, capture_output=True, text=True, check=False
+            # Run the command as a native subprocess, capturing stdout and stderr
+            # together in memory
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
             )
+            tag_task = None
+            try:
+                # Read the output as it arrives, stopping at the filepath line
+                output_lines = []
+                output_file = None
+                async for raw_line in process.stdout:
+                    line = raw_line.decode("utf-8", "replace").rstrip()
+                    output_lines.append(line)
+                    if line.endswith(f".{audio_format}"):
+                        output_file = line
+                        break
+
+                # Tag the file while yt-dlp shuts down
+                if meta_task and output_file and os.path.exists(output_file):
+                    tag_task = asyncio.create_task(
+                        _tag_file(url, output_file, meta_task)
+                    )
+
+                # Drain the rest of the output and wait for yt-dlp to exit
+                remaining, _ = await process.communicate()
+                if tag_task:
+                    await tag_task
+            except BaseException:
+                # Don't leave yt-dlp running (with nobody draining its pipe) if the
+                # download is cancelled or reading its output fails
+                if tag_task:
+                    tag_task.cancel()
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
             exit_code = process.returncode
-            output_content = process.stdout
-            
-            # Write the output to a temporary file for debugging if needed
-            with open(temp_output_file, "w") as f:
-                f.write(output_content)
-                
-            # Look for the filepath in the output
-            output_file = None
-            for line in output_content.splitlines():
-                if line.endswith(f".{audio_format}"):
-                    output_file = line
-                    break
-
-            # Clean up temporary file
-            if os.path.exists(temp_output_file):
-                os.remove(temp_output_file)
 
             # If download was successful and we found the output file
             if exit_code == 0 and output_file and os.path.exists(output_file):
-                # Update the metadata if enabled
-                if with_metadata and track_info:
-                    print(f"Updating metadata for: {os.path.basename(output_file)}")
-                    await asyncio.to_thread(update_metadata, output_file, track_info)
                 return True, url
             
             print(f"Failed to download: {url}")
-            if process.stderr:
-                print(f"Error: {process.stderr}")
+            output_lines.extend(remaining.decode("utf-8", "replace").splitlines())
+            output_content = _error_summary(output_lines)
+            if output_content:
+                print(f"Error: {output_content}")
             return False, url
             
         except Exception as e:
             print(f"Error downloading {url}: {e}")
-            if os.path.exists(temp_output_file):
-                os.remove(temp_output_file)
             return False, url
 
+        finally:
+            # The metadata is not needed if the download failed
+            if meta_task and not meta_task.done():
+                meta_task.cancel()
+
 
 async def main_async():
     parser = argparse.ArgumentParser(
@@ -137,6 +201,15 @@ async def main_async():
 
     args = parser.parse_args()
 
+    # Fail fast instead of launching one doomed subprocess per URL
+    missing = check_dependencies()
+    if missing:
+        print(f"Error: required programs not found on PATH: {', '.join(missing)}")
+        sys.exit(1)
+
+    # Create the output directory once, up front
+    os.makedirs(args.output_dir, exist_ok=True)
+
     if not args.no_metadata:
         print("Metadata extraction and tagging is enabled")
     
@@ -144,23 +217,26 @@ async def main_async():
 
     # Create a semaphore to limit concurrent downloads
     semaphore = asyncio.Semaphore(args.parallel)
-    
-    # Prepare the tasks
-    tasks = [
-        download_soundcloud(
-            url, 
-            args.output_dir, 
-            args.format, 
-            args.quality, 
-            not args.no_metadata,
-            semaphore
-        )
-        for url in args.urls
-    ]
-    
-    # Use tqdm to show progress
-    print(f"Starting download of {len(tasks)} tracks...")
-    results = await async_tqdm.gather(*tasks, desc="Downloading tracks")
+
+    # Share one bounded, keep-alive HTTP client across the batch
+    async with create_async_client(max_connections=args.parallel) as client:
+        # Prepare the tasks
+        tasks = [
+            download_soundcloud(
+                url, 
+                args.output_dir, 
+                args.format, 
+                args.quality, 
+                not args.no_metadata,
+                semaphore,
+                client
+            )
+            for url in args.urls
+        ]
+        
+        # Use tqdm to show progress
+        print(f"Starting download of {len(tasks)} tracks...")
+        results = await async_tqdm.gather(*tasks, desc="Downloading tracks")
     
     # Count successes and failures
     success_count = sum(1 for success, _ in results if success)
@@ -178,10 +254,8 @@ async def main_async():
 
 def main():
     """Entry point for the script."""
-    if sys.platform == "win32":
-        # Set the event loop policy for Windows
-        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-    
+    # Note: the default (Proactor) event loop is kept on Windows, since the
+    # Selector loop does not support asyncio subprocesses
     # Run the async main function
     asyncio.run(main_async())
 
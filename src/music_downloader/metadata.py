@@ -1,147 +1,608 @@
 """SoundCloud metadata extractor"""
 
-import argparse
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import html
+import importlib.util
+import os
 import re
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from mutagen.easyid3 import EasyID3
-from mutagen.mp3 import MP3
-from rich import print as rprint
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from requests.adapters import HTTPAdapter
+
+try:
+    # orjson is an optional, faster drop-in for parsing the hydration JSON
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+# Prefer the C-backed lxml tree builder, but still work without it
+_HTML_PARSER: str = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+try:
+    # diskcache is optional; without it pages and parsed results are not cached on disk
+    from diskcache import Cache  # type: ignore[import-untyped,import-not-found]
+except ImportError:
+    Cache = None  # type: ignore[assignment,misc]
+
+_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Shared session so connections to soundcloud.com are kept alive across calls.
+# It is deliberately a plain Session: requests-cache's CachedSession reads and
+# stores the whole body before a streamed response is handed back, which would
+# defeat the _MAX_PAGE_BYTES cap below.
+_SESSION: requests.Session = requests.Session()
+_SESSION.headers.update({"User-Agent": _USER_AGENT})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Upper bound on how much of a page is read; every field we extract, including
+# the hydration JSON, sits well within this
+_MAX_PAGE_BYTES: int = 2 * 1024 * 1024
+
+# On-disk cache, opened lazily on first use, holding:
+# - fetched (capped) page bodies keyed by normalized URL, for _PAGE_CACHE_EXPIRE
+#   seconds, so re-runs and retries skip the network
+# - parsed metadata keyed by the sha256 of the page HTML, so pages seen before
+#   (reposts, retries, re-runs) skip parsing entirely
+_DISK_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache", "music_downloader", "meta")
+_DISK_CACHE_SIZE_LIMIT: int = 256 * 1024 * 1024
+_DISK_CACHE: Any = None
+_PAGE_CACHE_EXPIRE: int = 3600
+# Part of every parse cache key; bump it whenever extraction or title formatting
+# changes so results cached by older versions are no longer served
+_PARSE_CACHE_VERSION: int = 2
+
+# Patterns for the regex fast path, applied directly to the page bytes. Attribute
+# values may use either quote style; the matching alternative holds the value.
+_OG_TITLE_RE: re.Pattern[bytes] = re.compile(
+    rb"""<meta[^>]+property=["']og:title["'][^>]+content=(?:"([^"]*)"|'([^']*)')""", re.I
+)
+_SC_USER_RE: re.Pattern[bytes] = re.compile(
+    rb"""<meta[^>]+property=["']soundcloud:user["'][^>]+content=(?:"([^"]*)"|'([^']*)')""", re.I
+)
+_SCHEMA_ARTIST_RE: re.Pattern[bytes] = re.compile(
+    rb"""<div[^>]+itemprop=["']byArtist["'][^>]*>(?:(?!</div>).)*?"""
+    rb"""<meta[^>]+itemprop=["']name["'][^>]+content=(?:"([^"]*)"|'([^']*)')""",
+    re.I | re.S,
+)
+_TITLE_RE: re.Pattern[bytes] = re.compile(rb"<title[^>]*>(.*?)</title>", re.I | re.S)
+_HYDRATION_RE: re.Pattern[bytes] = re.compile(rb"window\.__sc_hydration\s*=\s*(\[.*?\]);\s*</script>", re.S)
+_MARKUP_RE: re.Pattern[bytes] = re.compile(rb"<[^>]*>")
+
+# Patterns for picking apart and formatting the extracted text
+_TITLE_BY_RE: re.Pattern[str] = re.compile(r"(.+) by (.+) \| Listen")
+_BY_RE: re.Pattern[str] = re.compile(r"by (.+) \| Listen")
+_ARTIST_URL_RE: re.Pattern[str] = re.compile(r"soundcloud\.com/([^/]+)")
+_ARTIST_TITLE_RE: re.Pattern[str] = re.compile(r"^(.*?)\s+-\s+(.+)$")
+# "with" -> "w/", "feat"/"feat."/"featuring" -> "ft" and runs of spaces -> one
+# space, all in a single pass over the title
+_TITLE_NORMALIZE_RE: re.Pattern[str] = re.compile(
+    r"\b(with|feat\.?|featuring)\b| {2,}", re.IGNORECASE
+)
+
+# The soup fallback only reads these tags, so only they are built into the tree
+_SOUP_STRAINER = SoupStrainer(["meta", "title", "div", "a"])
+
+
+def close_session() -> None:
+    """Close the shared HTTP session and its pooled connections."""
+    _SESSION.close()
+
+
+def _normalize_title_token(match: re.Match[str]) -> str:
+    """Replacement for a _TITLE_NORMALIZE_RE match."""
+    word = match.group(1)
+    if word is None:
+        return " "
+    return "w/" if word.lower() == "with" else "ft"
+
+
+def _split_artist_title(title: str) -> tuple[str, str] | None:
+    """Split an "ARTIST - TITLE" title into (artist, title), if it has both parts."""
+    artist_title_match = _ARTIST_TITLE_RE.match(title)
+    if artist_title_match:
+        extracted_artist = artist_title_match.group(1).strip()
+        extracted_title = artist_title_match.group(2).strip()
+        if extracted_artist and extracted_title:
+            return extracted_artist, extracted_title
+    return None
 
 
-def extract_soundcloud_metadata(url):
+@lru_cache(maxsize=256)
+def _profile_link_re(slug: str) -> re.Pattern[bytes]:
     """
-    Extract title and artist information from a SoundCloud URL.
+    Compile the pattern for the first <a> linking to /slug. The href may use
+    either quote style and the link text may contain nested markup; the slug
+    itself is matched exactly, as BeautifulSoup's href lookup does.
+    """
+    return re.compile(
+        rb"""<a\s(?:[^>]*?\s)?href=(["'])/(?-i:"""
+        + re.escape(slug.encode())
+        + rb""")\1[^>]*>(.*?)</a\s*>""",
+        re.I | re.S,
+    )
+
+
+def _str_or_none(value: object) -> str | None:
+    """Return value if it is a string, otherwise None."""
+    return value if isinstance(value, str) else None
+
+
+def _decode(match: re.Match[bytes]) -> str:
+    """Decode the captured attribute/text value of a fast path match."""
+    raw = match.group(match.lastindex or 0)
+    return html.unescape(raw.decode("utf-8", "replace")).strip()
+
+
+def _extract_fast(content: bytes) -> tuple[str, str, str | None] | None:
+    """
+    Pull the raw track fields straight out of the page bytes with regexes,
+    without building a DOM.
+
+    Args:
+        content (bytes): The SoundCloud page body.
+
+    Returns:
+        tuple or None: (title, artist, genre) or None if the title or artist
+        could not be found this way. The artist is empty when the title is
+        in "ARTIST - TITLE" form.
+    """
+    title: str | None = None
+    artist: str | None = None
+    genre: str | None = None
+
+    # Method 1: The hydration JSON embedded in the page carries the track itself
+    hydration_match = _HYDRATION_RE.search(content)
+    if hydration_match:
+        try:
+            hydration = _json_loads(hydration_match.group(1))
+        except ValueError:
+            hydration = []
+        if not isinstance(hydration, list):
+            hydration = []
+        for item in hydration:
+            if isinstance(item, dict) and item.get("hydratable") == "sound":
+                # Only trust string fields; anything else falls through to the meta tags
+                sound = item.get("data")
+                if not isinstance(sound, dict):
+                    break
+                user = sound.get("user")
+                title = _str_or_none(sound.get("title"))
+                artist = _str_or_none(user.get("username") if isinstance(user, dict) else None)
+                genre = _str_or_none(sound.get("genre"))
+                break
+
+    # Method 2: meta tags
+    if not title:
+        og_title_match = _OG_TITLE_RE.search(content)
+        if og_title_match:
+            title = _decode(og_title_match)
+
+    # An "ARTIST - TITLE" title already names the artist, skip the lookups below
+    if title and not artist and _split_artist_title(title):
+        return title, "", genre
+
+    if not artist:
+        soundcloud_user_match = _SC_USER_RE.search(content)
+        if soundcloud_user_match:
+            artist_match = _ARTIST_URL_RE.search(_decode(soundcloud_user_match))
+            if artist_match:
+                # Get the actual username from the profile link on the page
+                link_match = _profile_link_re(artist_match.group(1)).search(content)
+                if link_match:
+                    link_text = _MARKUP_RE.sub(b"", link_match.group(2))
+                    artist = html.unescape(link_text.decode("utf-8", "replace")).strip()
+
+    # Method 3: schema.org markup
+    if not artist:
+        schema_artist_match = _SCHEMA_ARTIST_RE.search(content)
+        if schema_artist_match:
+            artist = _decode(schema_artist_match)
+
+    # Method 4: title tag "Track Name by Artist Name | Listen online for free on SoundCloud"
+    if not title or not artist:
+        title_tag_match = _TITLE_RE.search(content)
+        if title_tag_match:
+            title_text = _decode(title_tag_match)
+            title_match = _TITLE_BY_RE.search(title_text)
+            if not title and title_match:
+                title = title_match.group(1).strip()
+            artist_match = _BY_RE.search(title_text)
+            if not artist and artist_match:
+                artist = artist_match.group(1).strip()
+
+    if not title or not artist:
+        return None
+    return title, artist, genre
+
+
+def _extract_soup(content: bytes) -> tuple[str, str, str | None]:
+    """
+    Extract the raw track fields by parsing the full HTML document.
+
+    Args:
+        content (bytes): The SoundCloud page body.
+
+    Returns:
+        tuple: (title, artist, genre) with "not found" placeholders. The artist
+        is empty when the title is in "ARTIST - TITLE" form.
+    """
+    soup = BeautifulSoup(content, _HTML_PARSER, parse_only=_SOUP_STRAINER)
+
+    # Collect everything the methods below need in a single walk over the tree
+    metas: dict[str, str] = {}
+    anchors: dict[str, Tag] = {}
+    title_text: str | None = None
+    schema_artist: Tag | None = None
+    artist_href: str | None = None
+    og_title_split = False
+    for tag in soup.descendants:
+        if not isinstance(tag, Tag):
+            continue
+        if tag.name == "meta":
+            key = tag.get("property") or tag.get("name")
+            value = tag.get("content")
+            if isinstance(key, str) and isinstance(value, str) and key not in metas:
+                metas[key] = value
+                if key == "og:title":
+                    og_title_split = _split_artist_title(value) is not None
+                elif key == "soundcloud:user":
+                    artist_match = _ARTIST_URL_RE.search(value)
+                    if artist_match:
+                        artist_href = f"/{artist_match.group(1)}"
+        elif tag.name == "title":
+            if title_text is None:
+                title_text = tag.text
+        elif tag.name == "a":
+            href = tag.get("href")
+            if isinstance(href, str) and href not in anchors:
+                anchors[href] = tag
+        elif tag.name == "div":
+            if schema_artist is None and tag.get("itemprop") == "byArtist":
+                schema_artist = tag
+
+        # Stop early once the preferred title and artist sources have been seen. A
+        # profile link without text (e.g. an avatar) leaves the artist to the
+        # schema.org block or the <title>, so keep going until those are seen too
+        if "og:title" in metas and (
+            og_title_split
+            or (
+                artist_href in anchors
+                and (
+                    anchors[artist_href].text.strip()
+                    or (schema_artist is not None and title_text is not None)
+                )
+            )
+        ):
+            break
+
+    # Method 1: Try to extract from meta tags (most reliable)
+    if metas.get("og:title"):
+        title = metas["og:title"]
+    elif title_text is not None:
+        # Fallback to title tag pattern: "Track Name by Artist Name | Listen online for free on SoundCloud"
+        title_match = _TITLE_BY_RE.search(title_text)
+        if title_match:
+            title = title_match.group(1).strip()
+        else:
+            title = "Title not found"
+    else:
+        title = "Title not found"
+
+    # An "ARTIST - TITLE" title already names the artist, skip the lookups below
+    if _split_artist_title(title):
+        return title, "", None
+
+    # Extract artist name
+    # Method 1: Try from the meta tags
+    artist: str | None = None
+    if artist_href in anchors:
+        # Get the actual username from the profile link on the page
+        artist = anchors[artist_href].text.strip()
+
+    # Method 2: Try alternative extraction from schema.org markup
+    if not artist:
+        if schema_artist:
+            artist_meta = schema_artist.find("meta", {"itemprop": "name"})
+            if artist_meta:
+                artist_name = artist_meta.get("content")
+                if isinstance(artist_name, str):
+                    artist = artist_name
+
+    # Method 3: Extract from title tag if still not found
+    if not artist:
+        if title_text is not None:
+            title_match = _BY_RE.search(title_text)
+            if title_match:
+                artist = title_match.group(1).strip()
+            else:
+                artist = "Artist not found"
+        else:
+            artist = "Artist not found"
+
+    return title, artist, None
+
+
+def _normalize_url(url: str) -> str:
+    """Normalize a track URL (lowercase host, no query/fragment) for caching."""
+    parts = urlsplit(url.strip())
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", "")
+    )
+
+
+def _get_disk_cache() -> Any:
+    """Return the on-disk cache, or None if diskcache is unavailable."""
+    global _DISK_CACHE
+    if _DISK_CACHE is None:
+        _DISK_CACHE = False
+        if Cache is not None:
+            try:
+                _DISK_CACHE = Cache(_DISK_CACHE_DIR, size_limit=_DISK_CACHE_SIZE_LIMIT)
+            except Exception as e:
+                print(f"Metadata cache disabled: {e}")
+    # Compare with False explicitly: an empty diskcache.Cache is falsy
+    return _DISK_CACHE if _DISK_CACHE is not False else None
+
+
+def _get_cached_page(url: str) -> bytes | None:
+    """Return the body fetched for a (normalized) URL, if it is still cached."""
+    cache = _get_disk_cache()
+    if cache is None:
+        return None
+    return cache.get(f"page:{url}")
+
+
+def _cache_page(url: str, content: bytes) -> None:
+    """Cache the body fetched for a (normalized) URL for _PAGE_CACHE_EXPIRE seconds."""
+    cache = _get_disk_cache()
+    if cache is not None:
+        cache.set(f"page:{url}", content, expire=_PAGE_CACHE_EXPIRE)
+
+
+def _parse_page(content: bytes) -> dict[str, str]:
+    """
+    Extract and format the track metadata from a SoundCloud page body.
+    Results are cached on disk by the sha256 of the page when diskcache is installed.
+
+    Args:
+        content (bytes): The SoundCloud page body.
+
+    Returns:
+        dict: {'title': title, 'artist': artist}, plus 'genre' when available.
+    """
+    cache = _get_disk_cache()
+    key = ""
+    if cache is not None:
+        key = f"v{_PARSE_CACHE_VERSION}:{hashlib.sha256(content).hexdigest()}"
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Try the regex fast path first, only parse the HTML if it misses
+    fields = _extract_fast(content)
+    if fields is None:
+        fields = _extract_soup(content)
+    title, artist, genre = fields
+
+    # Check for "ARTIST - TITLE" pattern in the title (with space-hyphen-space)
+    # (only used if we have both components, and overrides the artist found above)
+    artist_title = _split_artist_title(title)
+    if artist_title:
+        artist, title = artist_title
+
+    # Format the title: replace "with" with "w/" and "feat" with "ft", max one space.
+    # Plain substring checks skip the regex on titles with nothing to rewrite
+    lowered = title.lower()
+    if "  " in title or "with" in lowered or "feat" in lowered:
+        title = _TITLE_NORMALIZE_RE.sub(_normalize_title_token, title)
+
+    result = {"title": title, "artist": artist}
+    if genre:
+        result["genre"] = genre
+    if cache is not None:
+        cache.set(key, result)
+    return result
+
+
+@lru_cache(maxsize=512)
+def _extract_impl(url: str) -> dict[str, str]:
+    """
+    Fetch and parse a (normalized) SoundCloud URL.
+
+    Raises on failure so that errors are never cached.
+    """
+    content = _get_cached_page(url)
+    if content is None:
+        # Send a GET request to the URL, reading at most _MAX_PAGE_BYTES of the body
+        body = bytearray()
+        with _SESSION.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()  # Raise an exception for HTTP errors
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body += chunk
+                if len(body) >= _MAX_PAGE_BYTES:
+                    break
+        content = bytes(body[:_MAX_PAGE_BYTES])
+        _cache_page(url, content)
+    return _parse_page(content)
+
+
+def extract_soundcloud_metadata(url: str) -> dict[str, str]:
+    """
+    Extract title, artist and genre information from a SoundCloud URL.
     Automatically formats the title by replacing "with" with "w/" and "feat" with "ft".
     Handles "ARTIST - TITLE" pattern in title field.
+    Results are cached per normalized URL, so repeated URLs are only fetched once.
+    Network errors are reported and give placeholder values; any other error is raised.
 
     Args:
         url (str): The SoundCloud URL to scrape.
 
     Returns:
-        dict: {'title': title, 'artist': artist} - The extracted title and artist name.
+        dict: {'title': title, 'artist': artist} - The extracted title and artist name,
+            plus 'genre' when the page provides one.
     """
     try:
-        # Send a GET request to the URL
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise an exception for HTTP errors
+        # Hand out a copy so callers can't mutate the cached result
+        return dict(_extract_impl(_normalize_url(url)))
+    except requests.RequestException as e:
+        print(f"An error occurred: {e}")
+        return {"title": "Error extracting title", "artist": "Error extracting artist"}
 
-        # Parse the HTML content
-        soup = BeautifulSoup(response.text, "html.parser")
 
-        # Method 1: Try to extract from meta tags (most reliable)
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title.get("content")
-        else:
-            # Fallback to title tag
-            title_tag = soup.find("title")
-            if title_tag:
-                # Extract title from title tag pattern: "Track Name by Artist Name | Listen online for free on SoundCloud"
-                title_text = title_tag.text
-                title_match = re.search(r"(.+) by (.+) \| Listen", title_text)
-                if title_match:
-                    title = title_match.group(1).strip()
-                else:
-                    title = "Title not found"
-            else:
-                title = "Title not found"
-
-        # Extract artist name
-        # Method 1: Try from the meta tags
-        artist = None
-        soundcloud_user = soup.find("meta", property="soundcloud:user")
-        if soundcloud_user and soundcloud_user.get("content"):
-            # Extract username from the URL
-            artist_url = soundcloud_user.get("content")
-            artist_match = re.search(r"soundcloud\.com/([^/]+)", artist_url)
-            if artist_match:
-                # Get the actual username from the page
-                artist_element = soup.find("a", {"href": f"/{artist_match.group(1)}"})
-                if artist_element:
-                    artist = artist_element.text.strip()
-
-        # Method 2: Try alternative extraction from schema.org markup
-        if not artist:
-            schema_artist = soup.find("div", {"itemprop": "byArtist"})
-            if schema_artist:
-                artist_meta = schema_artist.find("meta", {"itemprop": "name"})
-                if artist_meta:
-                    artist = artist_meta.get("content")
-
-        # Method 3: Extract from title tag if still not found
-        if not artist:
-            title_tag = soup.find("title")
-            if title_tag:
-                title_match = re.search(r"by (.+) \| Listen", title_tag.text)
-                if title_match:
-                    artist = title_match.group(1).strip()
-                else:
-                    artist = "Artist not found"
-            else:
-                artist = "Artist not found"
+def create_async_client(max_connections: int | None = None) -> httpx.AsyncClient:
+    """
+    Create an HTTP/2 client configured for scraping SoundCloud pages.
+
+    Args:
+        max_connections (int, optional): Bound on the client's connection pool.
 
-        # Check for "ARTIST - TITLE" pattern in the title (with space-hyphen-space)
-        artist_title_pattern = r"^(.*?)\s+-\s+(.+)$"
-        artist_title_match = re.match(artist_title_pattern, title)
-        if artist_title_match:
-            extracted_artist = artist_title_match.group(1).strip()
-            extracted_title = artist_title_match.group(2).strip()
+    Returns:
+        httpx.AsyncClient: The client; the caller is responsible for closing it.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": _USER_AGENT},
+        timeout=10,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections),
+    )
 
-            # Only use this pattern if we have both components
-            if extracted_artist and extracted_title:
-                # Update the title to just the title part
-                title = extracted_title
-                # Override the artist with the artist part from the title
-                artist = extracted_artist
 
-        # Format the title: replace "with" with "w/" and "feat" with "ft"
-        title = re.sub(r"\bwith\b", "w/", title, flags=re.IGNORECASE)
-        title = re.sub(r"\bfeat\.?\b", "ft", title, flags=re.IGNORECASE)
-        title = re.sub(r"\bfeaturing\b", "ft", title, flags=re.IGNORECASE)
+async def _fetch_page_async(client: httpx.AsyncClient, url: str) -> bytes:
+    """Fetch a page with the async client, reading at most _MAX_PAGE_BYTES of the body."""
+    body = bytearray()
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) >= _MAX_PAGE_BYTES:
+                break
+    return bytes(body[:_MAX_PAGE_BYTES])
 
-        # max one space
-        title = re.sub(r' {2,}', ' ', title)
 
-        return {"title": title, "artist": artist}
+async def extract_soundcloud_metadata_async(
+    url: str, client: httpx.AsyncClient | None = None
+) -> dict[str, str]:
+    """
+    Async version of extract_soundcloud_metadata.
+
+    Pass one HTTP/2 client (see create_async_client) to concurrent calls so they
+    are multiplexed over one connection instead of each occupying a thread.
+    As in the sync version, only network errors give placeholder values.
+
+    Args:
+        url (str): The SoundCloud URL to scrape.
+        client (httpx.AsyncClient, optional): Client to fetch with; defaults to
+            a client opened for this call only.
 
-    except Exception as e:
+    Returns:
+        dict: {'title': title, 'artist': artist} - The extracted title and artist name,
+            plus 'genre' when the page provides one.
+    """
+    try:
+        url = _normalize_url(url)
+        content = _get_cached_page(url)
+        if content is None:
+            if client is None:
+                # Pooled connections belong to the event loop that opened them, so a
+                # client kept across calls would break under a later asyncio.run()
+                async with create_async_client() as own_client:
+                    content = await _fetch_page_async(own_client, url)
+            else:
+                content = await _fetch_page_async(client, url)
+            _cache_page(url, content)
+        return _parse_page(content)
+    except httpx.HTTPError as e:
         print(f"An error occurred: {e}")
         return {"title": "Error extracting title", "artist": "Error extracting artist"}
 
 
-def update_metadata(file_path, track_info):
+def extract_many(
+    urls: list[str], concurrency: int = 16
+) -> list[dict[str, str] | BaseException]:
+    """
+    Extract metadata for many SoundCloud URLs concurrently.
+
+    The pages are fetched with extract_soundcloud_metadata_async over one
+    HTTP/2 client, with at most `concurrency` requests in flight. A page that
+    fails to parse does not sink the batch: its exception is returned in place
+    of its result, so callers can report or retry just that URL.
+
+    Args:
+        urls (list): The SoundCloud URLs to scrape.
+        concurrency (int): Maximum number of concurrent requests.
+
+    Returns:
+        list: One metadata dict (or the exception raised) per URL, in the same
+            order as `urls`.
+    """
+
+    async def run() -> list[dict[str, str] | BaseException]:
+        semaphore = asyncio.Semaphore(concurrency)
+        async with create_async_client(max_connections=concurrency) as client:
+
+            async def extract(url: str) -> dict[str, str]:
+                async with semaphore:
+                    return await extract_soundcloud_metadata_async(url, client)
+
+            return await asyncio.gather(
+                *(extract(url) for url in urls), return_exceptions=True
+            )
+
+    return asyncio.run(run())
+
+
+def update_metadata(file_path: str, track_info: dict[str, str]) -> bool:
     """Update the MP3 file with basic metadata (no artwork)"""
+    # mutagen is only needed for tagging, so scraping-only callers don't import it
+    from mutagen import File, MutagenError
+    from mutagen.id3 import ID3
+
     try:
-        # Create ID3 tags if they don't exist
-        try:
-            audio = EasyID3(file_path)
-        except:
-            # If the file doesn't have an ID3 tag, add one
-            audio = MP3(file_path)
+        # Open the file once, creating the tags in memory if they don't exist
+        audio = File(file_path, easy=True)
+        if audio is None:
+            print(f"Error updating metadata: unsupported file type: {file_path}")
+            return False
+        if audio.tags is None:
             audio.add_tags()
-            audio.save()
-            audio = EasyID3(file_path)
+
+        # Formats without an easy tag wrapper (e.g. WAV/AIFF) get raw ID3 frames,
+        # which don't accept the plain "title"/"artist" keys used below
+        if isinstance(audio.tags, ID3):
+            print(f"Error updating metadata: unsupported file type: {file_path}")
+            return False
 
         # Set the basic metadata
+        tags = {}
         if track_info.get("title"):
-            audio["title"] = track_info["title"]
+            tags["title"] = track_info["title"]
         if track_info.get("artist"):
-            audio["artist"] = track_info["artist"]
-            audio["albumartist"] = track_info["artist"]
-        if (
-            track_info.get("genre") and track_info["genre"]
-        ):  # Check if genre is not empty
-            audio["genre"] = track_info["genre"]
+            tags["artist"] = track_info["artist"]
+            tags["albumartist"] = track_info["artist"]
+        if track_info.get("genre"):  # Check if genre is not empty
+            tags["genre"] = track_info["genre"]
+
+        # Only touch the tags (and the file) when a value actually differs
+        changed = False
+        for key, value in tags.items():
+            if audio.get(key) != [value]:
+                audio[key] = value
+                changed = True
 
         # Save the changes
-        audio.save()
+        if changed:
+            audio.save()
         return True
-    except Exception as e:
+    except (MutagenError, OSError) as e:
         print(f"Error updating metadata: {e}")
         return False
 
@@ -151,10 +612,16 @@ if __name__ == "__main__":
     from rich import print as rprint
 
     parser = argparse.ArgumentParser(
-        description="Extract title and artist from a SoundCloud URL"
+        description="Extract title and artist from SoundCloud URLs"
     )
-    parser.add_argument("url", help="SoundCloud URL to extract info from")
+    parser.add_argument("urls", nargs="+", help="SoundCloud URLs to extract info from")
     args = parser.parse_args()
 
-    title_artist = extract_soundcloud_metadata(args.url)
-    rprint(title_artist)
+    if len(args.urls) == 1:
+        rprint(extract_soundcloud_metadata(args.urls[0]))
+    else:
+        for url, title_artist in zip(args.urls, extract_many(args.urls)):
+            if isinstance(title_artist, BaseException):
+                print(f"Error extracting metadata for {url}: {title_artist!r}")
+            else:
+                rprint(title_artist)
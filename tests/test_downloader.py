@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+import soundcloud_downloader
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses a shell script as yt-dlp")
+
+
+@pytest.fixture
+def fake_yt_dlp(tmp_path, monkeypatch):
+    """Install a yt-dlp stand-in on PATH that runs the given shell body."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+
+    def install(body):
+        script = bin_dir / "yt-dlp"
+        script.write_text("#!/bin/sh\n" + body)
+        script.chmod(0o755)
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return install
+
+
+@pytest.fixture
+def processes(monkeypatch):
+    """Record the subprocesses started by the downloader."""
+    started = []
+    create = asyncio.create_subprocess_exec
+
+    async def create_and_record(*args, **kwargs):
+        process = await create(*args, **kwargs)
+        started.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", create_and_record)
+    return started
+
+
+def download(url, output_dir, **kwargs):
+    kwargs.setdefault("with_metadata", False)
+    return asyncio.run(
+        asyncio.wait_for(
+            soundcloud_downloader.download_soundcloud(url, str(output_dir), **kwargs), 10
+        )
+    )
+
+
+def test_kills_yt_dlp_when_reading_output_fails(fake_yt_dlp, processes, tmp_path):
+    # A line longer than the stream reader's limit makes the read raise ValueError
+    fake_yt_dlp("head -c 200000 /dev/zero | tr '\\0' x\necho\nexec sleep 30\n")
+    assert download("https://x/long", tmp_path) == (False, "https://x/long")
+    (process,) = processes
+    assert process.returncode is not None
+
+
+# Prints the final path of the "download" the way --print after_move:filepath does
+WRITE_FILE = 'f="$(dirname "$7")/track.$3"\n: > "$f"\necho "$f"\n'
+
+
+def test_tagging_error_keeps_download_successful(fake_yt_dlp, monkeypatch, tmp_path):
+    async def extract(url, client=None):
+        return {"title": "T", "artist": "A"}
+
+    def update_metadata(path, track_info):
+        raise TypeError("'T' not a Frame instance")
+
+    fake_yt_dlp(WRITE_FILE)
+    monkeypatch.setattr(soundcloud_downloader, "extract_soundcloud_metadata_async", extract)
+    monkeypatch.setattr(soundcloud_downloader, "update_metadata", update_metadata)
+    url = "https://x/track"
+    assert download(url, tmp_path, with_metadata=True) == (True, url)
+    assert (tmp_path / "track.mp3").exists()
+
+
+def test_failure_prints_only_errors(fake_yt_dlp, capsys, tmp_path):
+    fake_yt_dlp(
+        "i=0\nwhile [ $i -lt 500 ]; do echo \"[download] $i%\"; i=$((i+1)); done\n"
+        "echo 'WARNING: slow' >&2\necho 'ERROR: broken' >&2\nexit 1\n"
+    )
+    assert download("https://x/fail", tmp_path) == (False, "https://x/fail")
+    out = capsys.readouterr().out
+    assert "Error: WARNING: slow\nERROR: broken\n" in out
+    assert "[download]" not in out
+
+
+def test_error_summary_falls_back_to_last_lines():
+    lines = [f"line {i}" for i in range(20)]
+    assert soundcloud_downloader._error_summary(lines) == "\n".join(lines[-5:])
+    assert soundcloud_downloader._error_summary([]) == ""
+
+
+def test_default_semaphore_across_event_loops(fake_yt_dlp, tmp_path):
+    fake_yt_dlp(WRITE_FILE)
+    for i in range(16):
+        (tmp_path / str(i)).mkdir()
+
+    async def download_many():
+        # More downloads than permits, so the semaphore is contended
+        return await asyncio.gather(
+            *(
+                soundcloud_downloader.download_soundcloud(
+                    f"https://x/{i}", str(tmp_path / str(i)), with_metadata=False
+                )
+                for i in range(16)
+            )
+        )
+
+    for _ in range(2):
+        results = asyncio.run(download_many())
+        assert all(success for success, _ in results)
@@ -0,0 +1,322 @@
+import asyncio
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from music_downloader import metadata
+
+META_PAGE = b"""<html><head>
+<title>DJ X - Track with Y by DJ X | Listen online for free on SoundCloud</title>
+<meta property="og:title" content="DJ X - Track  with Y &amp; Z">
+<meta property="soundcloud:user" content="https://soundcloud.com/dj-x">
+</head><body><a href="/dj-x">DJ X Display</a></body></html>"""
+
+ANCHOR_PAGE = b"""<html><head>
+<title>Foo by Title Artist | Listen online for free on SoundCloud</title>
+<meta property="og:title" content="Foo">
+<meta property="soundcloud:user" content="https://soundcloud.com/bar-b">
+</head><body><a href="/other">Other</a><a href="/bar-b">  Bar B </a></body></html>"""
+
+SCHEMA_PAGE = b"""<html><head>
+<meta property="og:title" content="Just A Title">
+</head><body><div itemprop="byArtist"><meta itemprop="name" content="Schema Artist">
+</div></body></html>"""
+
+TITLE_ONLY_PAGE = b"""<html><head>
+<title>Song feat. Q by Title Artist | Listen online for free on SoundCloud</title>
+</head><body></body></html>"""
+
+HYDRATION_PAGE = b"""<html><head>
+<meta property="og:title" content="Ignored">
+</head><body><script>window.__sc_hydration = [{"hydratable": "user", "data": {}},
+{"hydratable": "sound", "data": {"title": "Song featuring Q", "genre": "House",
+"user": {"username": "Hydra Artist"}}}];</script></body></html>"""
+
+EMPTY_PAGE = b"<html><head></head><body></body></html>"
+
+# Pages both extractors can fully read (the soup fallback has no genre)
+SHARED_PAGES = [META_PAGE, ANCHOR_PAGE, SCHEMA_PAGE, TITLE_ONLY_PAGE]
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    # Keep the tests off the user's on-disk parse cache
+    monkeypatch.setattr(metadata, "_DISK_CACHE", False)
+
+
+def parse_with_soup(monkeypatch, content):
+    """Run _parse_page with the regex fast path disabled."""
+    with monkeypatch.context() as m:
+        m.setattr(metadata, "_extract_fast", lambda content: None)
+        return metadata._parse_page(content)
+
+
+def test_strainer_keeps_meta_tags():
+    soup = BeautifulSoup(META_PAGE, metadata._HTML_PARSER, parse_only=metadata._SOUP_STRAINER)
+    assert soup.find("meta", property="og:title") is not None
+    assert soup.find("meta", property="soundcloud:user") is not None
+    assert soup.find("a", href="/dj-x") is not None
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (META_PAGE, {"title": "Track w/ Y & Z", "artist": "DJ X"}),
+        (ANCHOR_PAGE, {"title": "Foo", "artist": "Bar B"}),
+        (SCHEMA_PAGE, {"title": "Just A Title", "artist": "Schema Artist"}),
+        (TITLE_ONLY_PAGE, {"title": "Song ft. Q", "artist": "Title Artist"}),
+        (
+            HYDRATION_PAGE,
+            {"title": "Song ft Q", "artist": "Hydra Artist", "genre": "House"},
+        ),
+        (EMPTY_PAGE, {"title": "Title not found", "artist": "Artist not found"}),
+    ],
+)
+def test_parse_page(content, expected):
+    assert metadata._parse_page(content) == expected
+
+
+@pytest.mark.parametrize("content", SHARED_PAGES)
+def test_fast_path_matches_soup(monkeypatch, content):
+    assert metadata._extract_fast(content) is not None
+    assert metadata._parse_page(content) == parse_with_soup(monkeypatch, content)
+
+
+def test_fast_path_misses_without_artist():
+    assert metadata._extract_fast(EMPTY_PAGE) is None
+
+
+def test_extract_soup_fields():
+    assert metadata._extract_soup(ANCHOR_PAGE) == ("Foo", "Bar B", None)
+    assert metadata._extract_soup(SCHEMA_PAGE) == ("Just A Title", "Schema Artist", None)
+    assert metadata._extract_soup(EMPTY_PAGE) == (
+        "Title not found",
+        "Artist not found",
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("Track with Y", "Track w/ Y"),
+        ("Track feat. Y", "Track ft. Y"),
+        ("Track Featuring Y", "Track ft Y"),
+        ("Track   Y", "Track Y"),
+        ("Without Within", "Without Within"),
+    ],
+)
+def test_title_normalization(title, expected):
+    page = f'<meta property="og:title" content="{title}"><title>x by A | Listen</title>'
+    assert metadata._parse_page(page.encode())["title"] == expected
+
+
+def test_extract_returns_copy(monkeypatch):
+    monkeypatch.setattr(metadata, "_extract_impl", lambda url: {"title": "T", "artist": "A"})
+    result = metadata.extract_soundcloud_metadata("https://soundcloud.com/a/t")
+    result["title"] = "Changed"
+    assert metadata.extract_soundcloud_metadata("https://soundcloud.com/a/t")["title"] == "T"
+
+
+def test_normalize_url():
+    assert (
+        metadata._normalize_url(" https://SoundCloud.com/a/t/?in=x#y ")
+        == "https://soundcloud.com/a/t"
+    )
+
+
+@pytest.mark.parametrize(
+    "sound",
+    [
+        '{"title": 5, "genre": ["x"], "user": {"username": 7}}',
+        '{"title": null, "user": "someone"}',
+        '["not", "a", "dict"]',
+    ],
+)
+def test_hydration_ignores_non_string_fields(sound):
+    page = (
+        b'<meta property="og:title" content="Meta Title">'
+        b"<title>x by Title Artist | Listen</title>"
+        b'<script>window.__sc_hydration = [{"hydratable": "sound", "data": '
+        + sound.encode()
+        + b"}];</script>"
+    )
+    assert metadata._parse_page(page) == {"title": "Meta Title", "artist": "Title Artist"}
+
+
+class DictCache(dict):
+    """Stand-in for diskcache.Cache."""
+
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+def test_parse_cache_key_is_versioned(monkeypatch):
+    digest = hashlib.sha256(SCHEMA_PAGE).hexdigest()
+    stale_key = f"v{metadata._PARSE_CACHE_VERSION - 1}:{digest}"
+    cache = DictCache({stale_key: {"title": "Stale", "artist": "Stale"}})
+    monkeypatch.setattr(metadata, "_DISK_CACHE", cache)
+
+    # Results cached by an older parser version are not served
+    assert metadata._parse_page(SCHEMA_PAGE)["artist"] == "Schema Artist"
+    assert cache[f"v{metadata._PARSE_CACHE_VERSION}:{digest}"]["artist"] == "Schema Artist"
+
+
+@pytest.mark.parametrize(
+    "anchor",
+    [
+        b"<a href='/bar-b'>Bar B</a>",
+        b'<a href="/bar-b"><span class="name">Bar B</span></a>',
+        b'<A class="user" HREF="/bar-b">\n  Bar B\n</A>',
+        b'<a href="/bar-b">Bar &amp; B</a>',
+    ],
+)
+def test_profile_link_variants(monkeypatch, anchor):
+    page = (
+        b'<title>Foo by Title Artist | Listen</title><meta property="og:title" content="Foo">'
+        b'<meta property="soundcloud:user" content="https://soundcloud.com/bar-b">'
+        b'<a href="/bar-b-2">Not Me</a><a href="/Bar-B">Nor Me</a>' + anchor
+    )
+    result = metadata._parse_page(page)
+    assert result["artist"] in ("Bar B", "Bar & B")
+    assert result == parse_with_soup(monkeypatch, page)
+
+
+def test_soup_skips_empty_profile_link():
+    page = (
+        b'<title>Foo by TitleGuy | Listen</title><meta property="og:title" content="Foo">'
+        b'<meta property="soundcloud:user" content="https://soundcloud.com/guy">'
+        b'<a href="/guy"><img src="avatar.jpg"></a><a href="/guy">Guy</a>'
+        b'<div itemprop="byArtist"><meta itemprop="name" content="Schema Guy"></div>'
+    )
+    assert metadata._extract_soup(page) == ("Foo", "Schema Guy", None)
+    assert metadata._extract_fast(page) == ("Foo", "Schema Guy", None)
+
+
+class EndlessResponse:
+    """Streamed response whose body never ends."""
+
+    def __init__(self):
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield META_PAGE
+        while True:
+            self.read += chunk_size
+            yield b"x" * chunk_size
+
+
+def test_extract_caps_page_size(monkeypatch):
+    response = EndlessResponse()
+    sizes = []
+    monkeypatch.setattr(metadata._SESSION, "get", lambda url, **kwargs: response)
+    monkeypatch.setattr(
+        metadata, "_parse_page", lambda content: sizes.append(len(content)) or {}
+    )
+    metadata._extract_impl.cache_clear()
+    metadata.extract_soundcloud_metadata("https://soundcloud.com/endless/page")
+    assert sizes == [metadata._MAX_PAGE_BYTES]
+    assert response.read <= metadata._MAX_PAGE_BYTES
+
+
+def test_parse_cache_is_filled_while_empty(monkeypatch):
+    cache = DictCache()
+    monkeypatch.setattr(metadata, "_DISK_CACHE", cache)
+    metadata._parse_page(SCHEMA_PAGE)
+    assert len(cache) == 1
+
+
+def test_page_cache_skips_network(monkeypatch):
+    cache = DictCache()
+    monkeypatch.setattr(metadata, "_DISK_CACHE", cache)
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request.url)
+        return httpx.Response(200, content=SCHEMA_PAGE)
+
+    async def extract_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            url = "https://soundcloud.com/a/Track/?in=x"
+            return [
+                await metadata.extract_soundcloud_metadata_async(url, client)
+                for _ in range(2)
+            ]
+
+    first, second = asyncio.run(extract_twice())
+    assert first == second == {"title": "Just A Title", "artist": "Schema Artist"}
+    assert len(requests_seen) == 1
+    assert cache["page:https://soundcloud.com/a/Track"] == SCHEMA_PAGE
+
+    # The sync extractor reads the same cached page without touching the session
+    monkeypatch.setattr(metadata._SESSION, "get", None)
+    metadata._extract_impl.cache_clear()
+    assert metadata.extract_soundcloud_metadata("https://soundcloud.com/a/Track") == first
+
+
+def test_extract_many_keeps_other_results(monkeypatch):
+    bad_page = b"<html>bad</html>"
+
+    def handler(request):
+        return httpx.Response(200, content=bad_page if "bad" in request.url.path else META_PAGE)
+
+    def parse_page(content, parse_page=metadata._parse_page):
+        if content == bad_page:
+            raise ValueError("unparseable")
+        return parse_page(content)
+
+    monkeypatch.setattr(metadata, "_parse_page", parse_page)
+    monkeypatch.setattr(
+        metadata,
+        "create_async_client",
+        lambda max_connections=None: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    good, bad, other = metadata.extract_many(
+        ["https://soundcloud.com/a/good", "https://soundcloud.com/a/bad", "https://soundcloud.com/b/x"],
+        concurrency=2,
+    )
+    assert good == other == {"title": "Track w/ Y & Z", "artist": "DJ X"}
+    assert isinstance(bad, ValueError)
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(META_PAGE)))
+        self.end_headers()
+        self.wfile.write(META_PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def page_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_extract_without_client_across_event_loops(page_server):
+    # Each asyncio.run() is a new event loop; nothing may be left bound to the old one
+    for _ in range(2):
+        result = asyncio.run(metadata.extract_soundcloud_metadata_async(f"{page_server}/a/t"))
+        assert result == {"title": "Track w/ Y & Z", "artist": "DJ X"}
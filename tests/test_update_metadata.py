@@ -0,0 +1,76 @@
+import os
+import wave
+
+import pytest
+from mutagen import File
+
+from music_downloader.metadata import update_metadata
+
+TRACK_INFO = {"title": "Song", "artist": "Artist", "genre": "House"}
+
+
+@pytest.fixture
+def mp3_path(tmp_path):
+    # A few silent MPEG-1 Layer III frames (128 kbps, 44.1 kHz), no ID3 tags
+    path = tmp_path / "track.mp3"
+    path.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 10)
+    return str(path)
+
+
+@pytest.fixture
+def wav_path(tmp_path):
+    path = tmp_path / "track.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b"\x00\x00" * 800)
+    return str(path)
+
+
+def test_adds_missing_tags(mp3_path):
+    assert File(mp3_path, easy=True).tags is None
+    assert update_metadata(mp3_path, TRACK_INFO)
+    assert dict(File(mp3_path, easy=True).tags) == {
+        "title": ["Song"],
+        "artist": ["Artist"],
+        "albumartist": ["Artist"],
+        "genre": ["House"],
+    }
+
+
+def test_skips_save_when_tags_match(mp3_path):
+    assert update_metadata(mp3_path, TRACK_INFO)
+    os.utime(mp3_path, ns=(0, 0))
+    assert update_metadata(mp3_path, TRACK_INFO)
+    assert os.stat(mp3_path).st_mtime_ns == 0
+
+    # A changed value is written
+    assert update_metadata(mp3_path, {**TRACK_INFO, "title": "Other"})
+    assert os.stat(mp3_path).st_mtime_ns != 0
+    assert File(mp3_path, easy=True)["title"] == ["Other"]
+
+
+def test_ignores_empty_fields(mp3_path):
+    assert update_metadata(mp3_path, {"title": "Song", "artist": "", "genre": ""})
+    assert dict(File(mp3_path, easy=True).tags) == {"title": ["Song"]}
+
+
+def test_unsupported_file(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not audio")
+    assert not update_metadata(str(path), TRACK_INFO)
+
+
+def test_wav_is_unsupported(wav_path):
+    assert not update_metadata(wav_path, TRACK_INFO)
+
+
+def test_missing_file(tmp_path):
+    assert not update_metadata(str(tmp_path / "missing.mp3"), TRACK_INFO)
+
+
+def test_corrupt_mp3(tmp_path):
+    path = tmp_path / "corrupt.mp3"
+    path.write_bytes(b"\x00" * 100)
+    assert not update_metadata(str(path), TRACK_INFO)